@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """Script to crawl GitHub repositories and store star counts."""
 
+import asyncio
 import logging
 import sys
 import os
@@ -39,9 +40,13 @@ def main():
         # Create crawler service
         crawler = CrawlerService(github_client, db_repository)
         
-        # Crawl 100,000 repositories
+        # Crawl 100,000 repositories, deferring secondary index maintenance
         target_count = int(os.getenv("TARGET_COUNT", "100000"))
-        crawled_count = crawler.crawl_repositories(target_count=target_count)
+        db_repository.begin_bulk_load()
+        try:
+            crawled_count = asyncio.run(crawler.crawl_repositories(target_count=target_count))
+        finally:
+            db_repository.end_bulk_load()
         
         # Log final count
         final_count = db_repository.get_repository_count()
@@ -5,12 +5,12 @@ import logging
 import sys
 import os
 import csv
-import json
 from datetime import datetime
 
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
+import orjson
 import psycopg2
 from psycopg2.extras import RealDictCursor
 
@@ -21,6 +21,9 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+ITERSIZE = 10000  # Rows fetched per round-trip by the server-side cursors
+JSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NAIVE_UTC
+
 
 def get_db_connection():
     """Get database connection."""
@@ -44,7 +47,9 @@ def dump_to_csv(output_file: str):
     """Dump database to CSV."""
     conn = get_db_connection()
     try:
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        # Named (server-side) cursor streams rows instead of buffering the table
+        with conn.cursor(name="dump_csv_cursor", cursor_factory=RealDictCursor) as cur:
+            cur.itersize = ITERSIZE
             cur.execute("""
                 SELECT id, name, owner, full_name, stars, url, 
                        created_at, updated_at, crawled_at
@@ -52,19 +57,23 @@ def dump_to_csv(output_file: str):
                 ORDER BY stars DESC
             """)
             
-            rows = cur.fetchall()
+            first_row = cur.fetchone()
             
-            if not rows:
+            if first_row is None:
                 logger.warning("No data to dump")
                 return
             
             # Write CSV
+            count = 1
             with open(output_file, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=rows[0].keys())
+                writer = csv.DictWriter(f, fieldnames=first_row.keys())
                 writer.writeheader()
-                writer.writerows(rows)
+                writer.writerow(first_row)
+                for row in cur:
+                    writer.writerow(row)
+                    count += 1
             
-            logger.info(f"Dumped {len(rows)} repositories to {output_file}")
+            logger.info(f"Dumped {count} repositories to {output_file}")
     finally:
         conn.close()
 
@@ -73,7 +82,9 @@ def dump_to_json(output_file: str):
     """Dump database to JSON."""
     conn = get_db_connection()
     try:
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        # Named (server-side) cursor streams rows instead of buffering the table
+        with conn.cursor(name="dump_json_cursor", cursor_factory=RealDictCursor) as cur:
+            cur.itersize = ITERSIZE
             cur.execute("""
                 SELECT id, name, owner, full_name, stars, url, 
                        created_at, updated_at, crawled_at
@@ -81,27 +92,25 @@ def dump_to_json(output_file: str):
                 ORDER BY stars DESC
             """)
             
-            rows = cur.fetchall()
+            first_row = cur.fetchone()
             
-            if not rows:
+            if first_row is None:
                 logger.warning("No data to dump")
                 return
             
-            # Convert rows to list of dicts with serializable dates
-            data = []
-            for row in rows:
-                row_dict = dict(row)
-                # Convert datetime objects to ISO format strings
-                for key, value in row_dict.items():
-                    if isinstance(value, datetime):
-                        row_dict[key] = value.isoformat()
-                data.append(row_dict)
-            
-            # Write JSON
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            # Write JSON as a streamed array of rows; orjson serializes the
+            # RealDictRow rows and their datetimes natively, with no per-row copy
+            count = 1
+            with open(output_file, 'wb') as f:
+                f.write(b"[\n")
+                f.write(orjson.dumps(first_row, option=JSON_OPTIONS))
+                for row in cur:
+                    f.write(b",\n")
+                    f.write(orjson.dumps(row, option=JSON_OPTIONS))
+                    count += 1
+                f.write(b"\n]\n")
             
-            logger.info(f"Dumped {len(data)} repositories to {output_file}")
+            logger.info(f"Dumped {count} repositories to {output_file}")
     finally:
         conn.close()
 
@@ -1,8 +1,13 @@
 """Application service for crawling GitHub repositories."""
 
+import asyncio
 import logging
 import time
-from typing import Optional
+from collections import deque
+from dataclasses import dataclass
+from typing import Iterator, List, Optional
+
+from xxhash import xxh64_intdigest
 
 from src.infrastructure.github_client import GitHubGraphQLClient
 from src.infrastructure.database import DatabaseRepository
@@ -11,11 +16,30 @@ from src.domain.repository import Repository
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class _QueryProgress:
+    """Pagination state of one search query within a crawl worker's group."""
+
+    search_query: str
+    recent_new: deque  # New-repo ratio of the query's recent pages
+    cursor: Optional[str] = None
+    results: int = 0
+
+
 class CrawlerService:
     """Service for crawling GitHub repositories and storing them in the database."""
     
     BATCH_SIZE = 100  # Maximum repos per GraphQL query
-    BATCH_COMMIT_SIZE = 1000  # Commit to DB every N repos
+    BATCH_COMMIT_SIZE = 8000  # Commit to DB every N repos (one COPY + merge per commit)
+    MAX_WORKERS = 8  # Query groups crawled concurrently (coroutines)
+    QUERIES_PER_REQUEST = 5  # Searches batched into one aliased GraphQL request
+    # Pending page batches awaiting the DB writer; room for a full commit's worth
+    # of pages lets workers keep fetching while the writer is busy upserting
+    QUEUE_SIZE = BATCH_COMMIT_SIZE // BATCH_SIZE
+    YIELD_WINDOW = 3  # Recent pages considered when judging a query's yield
+    MIN_NEW_YIELD = 0.05  # Abandon a query once its recent pages are mostly duplicates
+    LOG_EVERY_N_PAGES = 10  # Progress is logged at INFO once per N pages fetched
+    RATE_LIMIT_MAX_PAUSE = 60  # Pause (seconds) when the rate limit runs low and its reset time is unknown
     
     # Multiple search queries to get around the 1,000 result limit per query
     # GitHub search is limited to 1,000 results per query, so we use different
@@ -185,18 +209,27 @@ class CrawlerService:
         self.github_client = github_client
         self.database_repository = database_repository
     
-    def crawl_repositories(self, target_count: int = 100000) -> int:
+    async def crawl_repositories(self, target_count: int = 100000) -> int:
         """
         Crawl GitHub repositories and store them in the database.
 
-        Dynamically expands search queries to reach the target number.
+        Dynamically expands search queries to reach the target number. Queries
+        are crawled concurrently by MAX_WORKERS coroutines, each paginating a
+        group of queries through batched GraphQL requests, while a single writer
+        task drains their results into the database.
         """
 
-        logger.info(f"Starting crawl for {target_count} repositories")
+        logger.info("Starting crawl for %d repositories", target_count)
 
-        total_crawled = 0
-        batch_buffer: list[Repository] = []
-        seen_repo_ids = set()  # Track seen repos to avoid duplicates
+        # Shared crawl state; workers are coroutines on one event loop, so
+        # updates between awaits need no locking
+        # Track seen repos to avoid duplicates; 64-bit id hashes are cheaper to
+        # store and hash than the GitHub node id strings themselves
+        self._seen_repo_ids: set[int] = set()
+        self._total_crawled = 0
+        self._pages_fetched = 0
+        self._target_count = target_count
+        self._target_reached = asyncio.Event()
 
         # Dynamic query generation (stars range)
         star_ranges = [
@@ -216,69 +249,221 @@ class CrawlerService:
             for lang in languages:
                 all_queries.append(f"language:{lang} stars:{rng}")
 
-        for search_query in all_queries:
-            if total_crawled >= target_count:
-                break
+        # Workers pull query groups from one shared iterator
+        query_groups = iter([
+            all_queries[i:i + self.QUERIES_PER_REQUEST]
+            for i in range(0, len(all_queries), self.QUERIES_PER_REQUEST)
+        ])
 
-            logger.info(f"Using search query: {search_query}")
-            cursor = None
-            query_results = 0
-            max_results_per_query = 1000  # GitHub search limit per query
+        batch_queue: asyncio.Queue = asyncio.Queue(maxsize=self.QUEUE_SIZE)
+        writer = asyncio.create_task(self._write_batches(batch_queue))
 
-            while total_crawled < target_count and query_results < max_results_per_query:
-                try:
-                    remaining = min(target_count - total_crawled, max_results_per_query - query_results)
-                    batch_size = min(self.BATCH_SIZE, remaining)
+        try:
+            async with self.github_client:
+                await asyncio.gather(*(
+                    self._crawl_worker(query_groups, batch_queue)
+                    for _ in range(self.MAX_WORKERS)
+                ))
+        finally:
+            # Sentinel tells the writer to flush its buffer and exit
+            await batch_queue.put(None)
+            await writer
 
-                    repos, next_cursor, api_remaining = self.github_client.get_repositories(
-                        limit=batch_size,
-                        cursor=cursor,
-                        search_query=search_query
-                    )
+        logger.info("Crawl completed. Total unique repositories crawled: %d", self._total_crawled)
+        return self._total_crawled
+
+    async def _crawl_worker(self, query_groups: Iterator[List[str]], batch_queue: asyncio.Queue):
+        """
+        Crawl query groups one after another until none are left.
+
+        Args:
+            query_groups: Shared iterator of query groups
+            batch_queue: Queue consumed by the database writer task
+        """
+        for search_queries in query_groups:
+            await self._crawl_query_group(search_queries, batch_queue)
 
-                    if not repos:
-                        logger.warning(f"No repositories returned from API for query: {search_query}")
-                        break
+    async def _crawl_query_group(self, search_queries: List[str], batch_queue: asyncio.Queue):
+        """
+        Paginate through a group of search queries, queueing new repositories.
+
+        Each round fetches the next page of every still-active query in the
+        group with a single aliased GraphQL request.
 
-                    # Filter out duplicates
-                    new_repos = [repo for repo in repos if repo.id not in seen_repo_ids]
-                    for repo in new_repos:
-                        seen_repo_ids.add(repo.id)
+        Args:
+            search_queries: GitHub search query strings
+            batch_queue: Queue consumed by the database writer task
+        """
+        if self._target_reached.is_set():
+            return
+
+        active: dict[str, _QueryProgress] = {}
+        for search_query in search_queries:
+            logger.info("Using search query: %s", search_query)
+            active[search_query] = _QueryProgress(
+                search_query=search_query,
+                recent_new=deque(maxlen=self.YIELD_WINDOW)
+            )
+
+        while active and not self._target_reached.is_set():
+            try:
+                remaining = self._target_count - self._total_crawled
+                if remaining <= 0:
+                    break
+                batch_size = min(self.BATCH_SIZE, remaining)
 
-                    batch_buffer.extend(new_repos)
-                    total_crawled += len(new_repos)
-                    query_results += len(repos)
+                results, api_remaining, reset_at = await self.github_client.get_repositories_multi(
+                    [(progress.search_query, progress.cursor) for progress in active.values()],
+                    limit=batch_size
+                )
 
-                    logger.info(
-                        f"Crawled {total_crawled}/{target_count} repositories "
-                        f"({len(new_repos)} new, {len(repos) - len(new_repos)} duplicates). "
-                        f"API calls remaining: {api_remaining}"
+                for progress, result in zip(list(active.values()), results):
+                    # A failed search only drops its own query from the group
+                    if result is None:
+                        logger.warning("Search failed, dropping query: %s", progress.search_query)
+                        del active[progress.search_query]
+                        continue
+                    repos, next_cursor = result
+                    if not await self._advance_query(progress, repos, next_cursor, api_remaining, batch_queue):
+                        del active[progress.search_query]
+
+                # Sleep until the rate limit resets rather than polling it;
+                # wakes early once the target is reached
+                if api_remaining is not None and api_remaining <= self.github_client.RATE_LIMIT_BUFFER:
+                    pause = self.RATE_LIMIT_MAX_PAUSE
+                    if reset_at is not None:
+                        pause = max(0, reset_at - time.time()) + 1
+                    logger.warning(
+                        "Low API rate limit: %d. Pausing %.0f seconds...",
+                        api_remaining, pause
                     )
+                    await self._wait_for_target(pause)
 
-                    # Commit in batches
-                    if len(batch_buffer) >= self.BATCH_COMMIT_SIZE:
-                        self.database_repository.upsert_repositories(batch_buffer)
-                        batch_buffer = []
+            except Exception as e:
+                logger.error("Error during crawl with queries %s: %s", list(active), e)
+                break
 
-                    # Pause if rate limit low
-                    if api_remaining <= 100:
-                        logger.warning(f"Low API rate limit: {api_remaining}. Pausing 1 minute...")
-                        time.sleep(60)
+    async def _advance_query(
+        self,
+        progress: _QueryProgress,
+        repos: List[Repository],
+        next_cursor: Optional[str],
+        api_remaining: Optional[int],
+        batch_queue: asyncio.Queue
+    ) -> bool:
+        """
+        Record one fetched page of a query and decide whether to keep paginating.
 
-                    if next_cursor:
-                        cursor = next_cursor
-                    else:
-                        logger.info(f"Reached end of results for query: {search_query}")
-                        break
+        Args:
+            progress: Pagination state of the query
+            repos: Repositories on the fetched page
+            next_cursor: Cursor of the following page, if any
+            api_remaining: Remaining API calls reported with the page, if known
+            batch_queue: Queue consumed by the database writer task
 
-                except Exception as e:
-                    logger.error(f"Error during crawl with query '{search_query}': {e}")
-                    break
+        Returns:
+            True if the query has further pages worth fetching
+        """
+        search_query = progress.search_query
+        max_results_per_query = 1000  # GitHub search limit per query
 
-        if batch_buffer:
-            self.database_repository.upsert_repositories(batch_buffer)
+        if not repos:
+            logger.warning("No repositories returned from API for query: %s", search_query)
+            return False
+
+        # Filter out duplicates in a single pass, never overshooting the
+        # target; method lookups are hoisted out of the loop
+        seen_repo_ids = self._seen_repo_ids
+        add_seen = seen_repo_ids.add
+        new_repos: list[Repository] = []
+        add_new = new_repos.append
+        room = self._target_count - self._total_crawled
+        for repo in repos:
+            if room <= 0:
+                break
+            repo_hash = xxh64_intdigest(repo.id.encode())
+            if repo_hash not in seen_repo_ids:
+                add_seen(repo_hash)
+                add_new(repo)
+                room -= 1
+
+        self._total_crawled += len(new_repos)
+        self._pages_fetched += 1
+        total_crawled = self._total_crawled
+        pages_fetched = self._pages_fetched
+
+        if total_crawled >= self._target_count:
+            self._target_reached.set()
+
+        progress.results += len(repos)
+        if new_repos:
+            await batch_queue.put(new_repos)
+
+        # Per-page progress is DEBUG; INFO gets a line every few pages
+        level = logging.INFO if pages_fetched % self.LOG_EVERY_N_PAGES == 0 else logging.DEBUG
+        if logger.isEnabledFor(level):
+            logger.log(
+                level,
+                "Crawled %d/%d repositories (%d new, %d duplicates). "
+                "API calls remaining: %s",
+                total_crawled, self._target_count,
+                len(new_repos), len(repos) - len(new_repos), api_remaining
+            )
+
+        # Stop paginating once the query mostly returns repos already seen
+        progress.recent_new.append(len(new_repos) / len(repos))
+        first_page_empty = progress.results == len(repos) and not new_repos
+        low_yield = (
+            len(progress.recent_new) == self.YIELD_WINDOW
+            and sum(progress.recent_new) / self.YIELD_WINDOW < self.MIN_NEW_YIELD
+        )
+        if first_page_empty or low_yield:
+            logger.info("Query yielding mostly duplicates, moving on: %s", search_query)
+            return False
+
+        if progress.results >= max_results_per_query:
+            return False
+
+        if not next_cursor:
+            logger.info("Reached end of results for query: %s", search_query)
+            return False
+
+        progress.cursor = next_cursor
+        return True
 
-        logger.info(f"Crawl completed. Total unique repositories crawled: {total_crawled}")
-        return total_crawled
+    async def _wait_for_target(self, timeout: float):
+        """Sleep for up to timeout seconds, waking early once the target is reached."""
+        try:
+            await asyncio.wait_for(self._target_reached.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
 
+    async def _write_batches(self, batch_queue: asyncio.Queue):
+        """
+        Drain queued repository batches into the database until a None sentinel.
+
+        Upserts run in a worker thread, so crawling continues while a batch is
+        being written.
 
+        Args:
+            batch_queue: Queue fed by the crawl workers
+        """
+        batch_buffer: list[Repository] = []
+
+        while True:
+            batch = await batch_queue.get()
+            if batch is None:
+                break
+
+            batch_buffer.extend(batch)
+
+            # Commit in batches; on failure keep the buffer for the next attempt
+            if len(batch_buffer) >= self.BATCH_COMMIT_SIZE:
+                try:
+                    await asyncio.to_thread(self.database_repository.upsert_repositories, batch_buffer)
+                    batch_buffer = []
+                except Exception as e:
+                    logger.error("Error writing batch to database: %s", e)
+
+        if batch_buffer:
+            await asyncio.to_thread(self.database_repository.upsert_repositories, batch_buffer)
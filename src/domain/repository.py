@@ -4,9 +4,9 @@ from dataclasses import dataclass
 from datetime import datetime
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Repository:
-    """Immutable repository entity."""
+    """Immutable repository entity (slotted, no per-instance __dict__)."""
     
     id: str
     name: str
@@ -1,10 +1,11 @@
 """Database connection and repository storage implementation."""
 
+import io
 import logging
 import psycopg2
-from psycopg2.extras import execute_values
+from pgcopy import CopyManager
 from psycopg2.pool import ThreadedConnectionPool
-from typing import List, Optional
+from typing import Dict, List, Optional
 import os
 
 from src.domain.repository import Repository
@@ -15,6 +16,21 @@ logger = logging.getLogger(__name__)
 class DatabaseRepository:
     """Repository for storing GitHub repository data in PostgreSQL."""
     
+    # Secondary indexes dropped during a bulk load and rebuilt afterwards.
+    # The primary key, the full_name unique constraint and the covering
+    # id index used by the upsert are always kept.
+    BULK_LOAD_INDEXES = {
+        "idx_repositories_stars": "repositories(stars)",
+        "idx_repositories_full_name": "repositories(full_name)",
+        "idx_repositories_owner": "repositories(owner)",
+        "idx_repositories_crawled_at": "repositories(crawled_at)",
+    }
+    
+    # Columns loaded into the staging table by binary COPY
+    STAGE_COLUMNS = (
+        "id", "name", "owner", "full_name", "stars", "url", "created_at", "updated_at"
+    )
+    
     def __init__(self, connection_string: Optional[str] = None):
         """
         Initialize database repository.
@@ -36,21 +52,49 @@ class DatabaseRepository:
             )
         
         self.connection_string = connection_string
+        
+        # Pool bounds; pool_max should be at least the number of threads using
+        # the repository concurrently (the crawler itself upserts from one)
+        self.pool_min = int(os.getenv("POSTGRES_POOL_MIN", "2"))
+        self.pool_max = int(os.getenv("POSTGRES_POOL_MAX", "32"))
         self.pool: Optional[ThreadedConnectionPool] = None
+        
+        # Set by initialize_schema once the server version is known
+        self.use_merge = False
+        
+        # While set, upserts commit without waiting for the WAL flush. A crash
+        # may lose the last few batches, which a re-crawl simply restores.
+        self.bulk_mode = False
+        
+        # Pooled connections already set up by _prepare_connection, keyed by id()
+        # and mapped to their staging table CopyManager (which holds a reference
+        # to the connection, so a cached id is never reused by another one)
+        self._prepared: Dict[int, CopyManager] = {}
     
     def connect(self):
         """Initialize connection pool."""
         try:
-            self.pool = ThreadedConnectionPool(1, 5, self.connection_string)
-            logger.info("Database connection pool created")
+            # TCP keepalives let idle pooled connections that died be detected
+            self.pool = ThreadedConnectionPool(
+                self.pool_min,
+                self.pool_max,
+                self.connection_string,
+                keepalives=1,
+                keepalives_idle=30
+            )
+            logger.info(
+                "Database connection pool created (%d-%d connections)",
+                self.pool_min, self.pool_max
+            )
         except Exception as e:
-            logger.error(f"Error creating connection pool: {e}")
+            logger.error("Error creating connection pool: %s", e)
             raise
     
     def close(self):
         """Close connection pool."""
         if self.pool:
             self.pool.closeall()
+            self._prepared.clear()
             logger.info("Database connection pool closed")
     
     def _get_connection(self):
@@ -89,21 +133,153 @@ class DatabaseRepository:
                     CREATE INDEX IF NOT EXISTS idx_repositories_full_name ON repositories(full_name);
                     CREATE INDEX IF NOT EXISTS idx_repositories_owner ON repositories(owner);
                     CREATE INDEX IF NOT EXISTS idx_repositories_crawled_at ON repositories(crawled_at);
+                    
+                    -- Covering index so the upsert's change-detection join is index-only
+                    CREATE INDEX IF NOT EXISTS idx_repositories_id_stars
+                        ON repositories(id) INCLUDE (stars, updated_at);
                 """)
                 conn.commit()
+                
+                # MERGE is available from PostgreSQL 15 onwards
+                self.use_merge = conn.server_version >= 150000
                 logger.info("Database schema initialized")
         except Exception as e:
             conn.rollback()
-            logger.error(f"Error initializing schema: {e}")
+            logger.error("Error initializing schema: %s", e)
             raise
         finally:
             self._return_connection(conn)
     
+    def begin_bulk_load(self):
+        """
+        Drop secondary indexes ahead of a bulk load.
+        
+        Every upsert otherwise maintains each of these indexes row by row;
+        end_bulk_load rebuilds them once the load is complete. Also enables
+        bulk_mode, so upserts use asynchronous commit until end_bulk_load.
+        """
+        conn = self._get_connection()
+        try:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "DROP INDEX IF EXISTS " + ", ".join(self.BULK_LOAD_INDEXES)
+                )
+                conn.commit()
+                self.bulk_mode = True
+                logger.info("Secondary indexes dropped for bulk load")
+        except Exception as e:
+            conn.rollback()
+            logger.error("Error dropping indexes for bulk load: %s", e)
+            raise
+        finally:
+            self._return_connection(conn)
+    
+    def end_bulk_load(self):
+        """Rebuild the secondary indexes dropped by begin_bulk_load."""
+        self.bulk_mode = False
+        conn = self._get_connection()
+        try:
+            # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+            conn.autocommit = True
+            with conn.cursor() as cur:
+                for index_name, definition in self.BULK_LOAD_INDEXES.items():
+                    cur.execute(
+                        f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name} ON {definition}"
+                    )
+                logger.info("Secondary indexes rebuilt after bulk load")
+        except Exception as e:
+            logger.error("Error rebuilding indexes after bulk load: %s", e)
+            raise
+        finally:
+            conn.autocommit = False
+            self._return_connection(conn)
+    
+    def _prepare_connection(self, conn) -> CopyManager:
+        """
+        Set up a pooled connection for upserts, once per connection.
+        
+        Creates the session's staging table (emptied on every commit) and a
+        prepared merge statement, so later batches skip re-parsing and
+        re-planning it. Returns the connection's CopyManager for the stage.
+        """
+        copy_manager = self._prepared.get(id(conn))
+        if copy_manager is not None:
+            return copy_manager
+        
+        try:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    CREATE TEMP TABLE IF NOT EXISTS repositories_stage
+                    (LIKE repositories INCLUDING DEFAULTS)
+                    ON COMMIT DELETE ROWS
+                """)
+                
+                if self.use_merge:
+                    # MERGE (PostgreSQL 15+) resolves matches with a single join
+                    # instead of a change-detection join plus an ON CONFLICT probe
+                    cur.execute("""
+                        PREPARE upsert_from_stage AS
+                        MERGE INTO repositories r
+                        USING repositories_stage s
+                        ON r.id = s.id
+                        WHEN MATCHED AND (
+                            r.stars != s.stars OR r.updated_at != s.updated_at
+                        ) THEN
+                            UPDATE SET
+                                stars = s.stars,
+                                updated_at = s.updated_at,
+                                crawled_at = CURRENT_TIMESTAMP
+                        WHEN NOT MATCHED THEN
+                            INSERT (
+                                id, name, owner, full_name, stars, url, created_at, updated_at
+                            )
+                            VALUES (
+                                s.id, s.name, s.owner, s.full_name, s.stars, s.url,
+                                s.created_at, s.updated_at
+                            )
+                    """)
+                else:
+                    # Only new or changed rows are selected from the stage, so unchanged
+                    # rows never reach ON CONFLICT and produce no dead tuples or WAL.
+                    # The ON CONFLICT WHERE clause still guards against concurrent writers
+                    cur.execute("""
+                        PREPARE upsert_from_stage AS
+                        INSERT INTO repositories (
+                            id, name, owner, full_name, stars, url, created_at, updated_at
+                        )
+                        SELECT s.id, s.name, s.owner, s.full_name, s.stars, s.url,
+                               s.created_at, s.updated_at
+                        FROM repositories_stage s
+                        LEFT JOIN repositories r ON r.id = s.id
+                        WHERE r.id IS NULL
+                           OR r.stars != s.stars
+                           OR r.updated_at != s.updated_at
+                        ON CONFLICT (id) 
+                        DO UPDATE SET
+                            stars = EXCLUDED.stars,
+                            updated_at = EXCLUDED.updated_at,
+                            crawled_at = CURRENT_TIMESTAMP
+                        WHERE repositories.stars != EXCLUDED.stars 
+                           OR repositories.updated_at != EXCLUDED.updated_at
+                    """)
+                
+                conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        
+        copy_manager = CopyManager(conn, "repositories_stage", self.STAGE_COLUMNS)
+        self._prepared[id(conn)] = copy_manager
+        return copy_manager
+    
     def upsert_repositories(self, repositories: List[Repository]):
         """
         Insert or update repositories in the database.
         
-        Uses PostgreSQL's ON CONFLICT for efficient upserts (only updates changed rows).
+        Rows are bulk loaded with COPY into a temporary staging table, then merged
+        with a single prepared MERGE (PostgreSQL 15+) or INSERT ... SELECT ...
+        ON CONFLICT statement. Unchanged rows are filtered out, so they are never
+        rewritten.
         
         Args:
             repositories: List of repository entities to store
@@ -113,49 +289,39 @@ class DatabaseRepository:
         
         conn = self._get_connection()
         try:
+            copy_manager = self._prepare_connection(conn)
+            
             with conn.cursor() as cur:
-                # Prepare data for bulk insert
-                values = [
-                    (
-                        repo.id,
-                        repo.name,
-                        repo.owner,
-                        repo.full_name,
-                        repo.stars,
-                        repo.url,
-                        repo.created_at,
-                        repo.updated_at,
-                    )
-                    for repo in repositories
-                ]
+                if self.bulk_mode:
+                    # Skip the fsync on COMMIT; the data is re-crawlable
+                    cur.execute("SET LOCAL synchronous_commit = off")
                 
-                # Use ON CONFLICT to update only if stars or updated_at changed
-                # The WHERE clause ensures minimal rows are affected - only rows with
-                # actual changes will be updated
-                execute_values(
-                    cur,
-                    """
-                    INSERT INTO repositories (
-                        id, name, owner, full_name, stars, url, created_at, updated_at
-                    ) VALUES %s
-                    ON CONFLICT (id) 
-                    DO UPDATE SET
-                        stars = EXCLUDED.stars,
-                        updated_at = EXCLUDED.updated_at,
-                        crawled_at = CURRENT_TIMESTAMP
-                    WHERE repositories.stars != EXCLUDED.stars 
-                       OR repositories.updated_at != EXCLUDED.updated_at
-                    """,
-                    values,
-                    template=None,
-                    page_size=1000
+                # Binary COPY packs values in wire format, skipping per-row SQL
+                # parsing and text conversion of the integer and timestamp columns
+                copy_manager.copy(
+                    (
+                        (
+                            repo.id,
+                            repo.name,
+                            repo.owner,
+                            repo.full_name,
+                            repo.stars,
+                            repo.url,
+                            repo.created_at,
+                            repo.updated_at,
+                        )
+                        for repo in repositories
+                    ),
+                    io.BytesIO
                 )
                 
+                cur.execute("EXECUTE upsert_from_stage")
+                
                 conn.commit()
-                logger.info(f"Upserted {len(repositories)} repositories")
+                logger.info("Upserted %d repositories", len(repositories))
         except Exception as e:
             conn.rollback()
-            logger.error(f"Error upserting repositories: {e}")
+            logger.error("Error upserting repositories: %s", e)
             raise
         finally:
             self._return_connection(conn)
@@ -169,7 +335,7 @@ class DatabaseRepository:
                 count = cur.fetchone()[0]
                 return count
         except Exception as e:
-            logger.error(f"Error getting repository count: {e}")
+            logger.error("Error getting repository count: %s", e)
             raise
         finally:
             self._return_connection(conn)
@@ -1,22 +1,246 @@
 """GitHub GraphQL API client with rate limiting and retry logic."""
 
+import asyncio
+import hashlib
 import time
 import logging
 import os
-from typing import List, Optional, Dict, Any
-import requests
+from collections import deque
+from functools import lru_cache
+from typing import AsyncIterator, Iterator, List, Optional, Dict, Any
+import aiohttp
+import diskcache
+import orjson
 
 from src.domain.repository import Repository
-from datetime import datetime
+from datetime import datetime, timezone
 
 logger = logging.getLogger(__name__)
 
+# Selection set shared by every aliased search in a repository query; only the
+# fields the Repository entity needs (name and owner come from nameWithOwner)
+REPOSITORY_SEARCH_FRAGMENT = """
+fragment RepositorySearch on SearchResultItemConnection {
+    pageInfo {
+        hasNextPage
+        endCursor
+    }
+    nodes {
+        ... on Repository {
+            id
+            nameWithOwner
+            stargazerCount
+            url
+            createdAt
+            updatedAt
+        }
+    }
+}
+"""
+
+
+def _parse_gh_ts(s: str) -> datetime:
+    """
+    Parse a GitHub timestamp, which always has the fixed shape YYYY-MM-DDTHH:MM:SSZ.
+    
+    Slicing the fixed fields avoids the string copies and generic ISO 8601
+    handling of ``datetime.fromisoformat(s.replace("Z", "+00:00"))``.
+    """
+    return datetime(
+        int(s[0:4]), int(s[5:7]), int(s[8:10]),
+        int(s[11:13]), int(s[14:16]), int(s[17:19]),
+        tzinfo=timezone.utc
+    )
+
+
+def _build_repositories(nodes: List[Dict[str, Any]]) -> Iterator[Repository]:
+    """
+    Lazily convert repository search nodes into Repository entities.
+    
+    Args:
+        nodes: The ``nodes`` of a search connection
+        
+    Returns:
+        Iterator building each Repository as it is consumed
+    """
+    parse_ts = _parse_gh_ts
+    return (
+        Repository(
+            id=node["id"],
+            name=name,
+            owner=owner,
+            full_name=full_name,
+            stars=node["stargazerCount"],
+            url=node["url"],
+            created_at=parse_ts(node["createdAt"]),
+            updated_at=parse_ts(node["updatedAt"])
+        )
+        for node in nodes
+        # Bind nameWithOwner and split it into owner/name once per node
+        for full_name in (node["nameWithOwner"],)
+        for owner, _, name in (full_name.partition("/"),)
+    )
+
+
+@lru_cache(maxsize=None)
+def _build_search_query(search_count: int) -> str:
+    """
+    Build the query document for a number of aliased searches.
+    
+    Only the number of searches varies between requests, so each document is
+    assembled once and reused for every later request of the same size.
+    
+    Args:
+        search_count: Number of aliased ``search`` fields (s0, s1, ...)
+        
+    Returns:
+        GraphQL query string taking $limit, $query{i} and $cursor{i}
+    """
+    variable_definitions = ["$limit: Int!"]
+    selections = []
+    for i in range(search_count):
+        variable_definitions.append(f"$query{i}: String!, $cursor{i}: String")
+        selections.append(
+            f"s{i}: search(query: $query{i}, type: REPOSITORY, first: $limit, "
+            f"after: $cursor{i}) {{ ...RepositorySearch }}"
+        )
+    
+    return f"""
+query({", ".join(variable_definitions)}) {{
+    {" ".join(selections)}
+    rateLimit {{
+        remaining
+        resetAt
+    }}
+}}
+{REPOSITORY_SEARCH_FRAGMENT}
+"""
+
 
 class RateLimitExceeded(Exception):
     """Raised when GitHub API rate limit is exceeded."""
     pass
 
 
+class AIMDController:
+    """
+    Adaptive limit on concurrent requests (additive increase, multiplicative decrease).
+    
+    Every success raises the limit by ``alpha`` up to ``c_max`` as long as the
+    average latency of the last ``LATENCY_WINDOW`` requests stays within
+    ``latency_target``; each congestion event (throttling or server errors)
+    multiplies it by ``beta``, down to ``c_min``. Errors from requests sent
+    before the last decrease belong to the event already handled and are
+    ignored, so a burst of concurrent failures cuts the limit once. Used as
+    ``async with controller as started:``.
+    """
+    
+    LATENCY_WINDOW = 32  # Recent requests averaged against the latency target
+    
+    def __init__(
+        self,
+        c_max: int,
+        c_min: int = 1,
+        alpha: float = 0.5,
+        beta: float = 0.5,
+        latency_target: Optional[float] = None
+    ):
+        """
+        Initialize the controller at its maximum concurrency.
+        
+        Args:
+            c_max: Upper bound (and starting value) for concurrent requests
+            c_min: Lower bound for concurrent requests
+            alpha: Additive increase applied on success
+            beta: Multiplicative decrease applied on error
+            latency_target: Average latency in seconds above which the limit
+                stops growing. If None, latency is not considered.
+        """
+        self.c = float(c_max)
+        self.c_min = c_min
+        self.c_max = c_max
+        self.alpha = alpha
+        self.beta = beta
+        self.latency_target = latency_target
+        self._latencies: deque = deque(maxlen=self.LATENCY_WINDOW)
+        self._in_flight = 0
+        self._condition = asyncio.Condition()
+        self._last_decrease = float("-inf")
+    
+    @property
+    def limit(self) -> int:
+        """Current number of requests allowed in flight."""
+        return max(self.c_min, int(self.c))
+    
+    async def __aenter__(self) -> float:
+        """Wait for a free slot; returns the monotonic time the slot was taken."""
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+        return time.monotonic()
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        """Free the slot and wake waiters, which may now fit under a raised limit."""
+        async with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+    
+    def on_success(self, latency: float):
+        """Record a successful request and grow the limit additively."""
+        self._latencies.append(latency)
+        average = sum(self._latencies) / len(self._latencies)
+        if self.latency_target is None or average <= self.latency_target:
+            self.c = min(self.c_max, self.c + self.alpha)
+    
+    def on_error(self, sent_at: float):
+        """
+        Record a throttled or failed request and shrink the limit multiplicatively.
+        
+        Args:
+            sent_at: Monotonic time the failed request was sent
+        """
+        if sent_at < self._last_decrease:
+            return
+        self.c = max(self.c_min, self.c * self.beta)
+        self._last_decrease = time.monotonic()
+        logger.debug("Concurrency limit reduced to %d", self.limit)
+
+
+class SlidingWindow:
+    """
+    Proactive limit on requests started per rolling window.
+    
+    ``acquire`` blocks once ``rpm`` requests have started within the last
+    ``WINDOW_SECONDS``, so bursts are smoothed before GitHub has to reject them.
+    """
+    
+    WINDOW_SECONDS = 60
+    
+    def __init__(self, rpm: int):
+        """
+        Initialize the limiter.
+        
+        Args:
+            rpm: Maximum number of requests per window
+        """
+        self.rpm = rpm
+        self.ts: deque = deque()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self):
+        """Wait until a request may start within the window, then record it."""
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            while True:
+                now = loop.time()
+                while self.ts and now - self.ts[0] >= self.WINDOW_SECONDS:
+                    self.ts.popleft()
+                if len(self.ts) < self.rpm:
+                    break
+                await asyncio.sleep(self.WINDOW_SECONDS - (now - self.ts[0]))
+            self.ts.append(now)
+
+
 class GitHubGraphQLClient:
     """Client for GitHub GraphQL API with rate limiting and retry mechanisms."""
     
@@ -28,13 +252,26 @@ class GitHubGraphQLClient:
     MAX_RETRIES = 5
     RETRY_DELAY_SECONDS = 1
     RATE_LIMIT_BUFFER = 100  # Reserve some API calls for safety
+    MAX_CONNECTIONS = 20  # Pooled keep-alive connections shared by concurrent requests
+    KEEPALIVE_SECONDS = 75  # Idle keep-alive; outlasts retry backoff and ~60s secondary-limit waits
+    CACHE_TTL_SECONDS = 3600  # How long a cached response may be reused
+    MAX_REQUESTS_PER_MINUTE = 300  # Keeps batched searches under GitHub's per-minute point ceiling
     
-    def __init__(self, token: Optional[str] = None):
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+        cache_dir: Optional[str] = None
+    ):
         """
         Initialize GitHub GraphQL client.
         
         Args:
             token: GitHub personal access token. If None, uses GITHUB_TOKEN env var.
+            max_concurrency: Maximum requests in flight at once. If None, uses
+                GH_MAX_CONCURRENCY env var (default 8).
+            cache_dir: Directory for the on-disk response cache. If None, uses
+                GH_CACHE_DIR env var; caching is disabled when neither is set.
         """
         if token is None:
             token = os.getenv("GITHUB_TOKEN")
@@ -48,7 +285,77 @@ class GitHubGraphQLClient:
         if self.token:
             self.headers["Authorization"] = f"Bearer {self.token}"
         
-    def _execute_query(self, query: str, variables: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        # Bounds concurrent requests to stay clear of GitHub's secondary rate limits,
+        # backing off when GitHub pushes back and recovering as requests succeed
+        if max_concurrency is None:
+            max_concurrency = int(os.getenv("GH_MAX_CONCURRENCY", "8"))
+        self.max_concurrency = max_concurrency
+        latency_target = os.getenv("GH_LATENCY_TARGET")
+        self.latency_target = float(latency_target) if latency_target else None
+        
+        # Paces request starts; the rate is tightened as the hourly budget runs low
+        self.max_rpm = int(os.getenv("GH_MAX_RPM", str(self.MAX_REQUESTS_PER_MINUTE)))
+        
+        # Optional on-disk cache of successful responses, keyed by query and variables
+        if cache_dir is None:
+            cache_dir = os.getenv("GH_CACHE_DIR")
+        self._cache: Optional[diskcache.Cache] = diskcache.Cache(cache_dir) if cache_dir else None
+        
+        # Last rate limit reported by GitHub; cached responses don't carry one
+        self._rate_remaining: Optional[int] = None
+        self._rate_reset_at: Optional[int] = None
+        
+        # Created on __aenter__; aiohttp sessions and asyncio synchronization
+        # primitives are bound to the event loop they are first used in
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._concurrency: Optional[AIMDController] = None
+        self._window: Optional[SlidingWindow] = None
+        self._rate_limit_gate: Optional[asyncio.Event] = None
+    
+    async def __aenter__(self) -> "GitHubGraphQLClient":
+        """
+        Open the HTTP session whose pooled connections are shared by all requests.
+        
+        Request limiters are rebuilt here as well, so a client can be reused
+        across event loops (e.g. successive ``asyncio.run`` calls).
+        """
+        self._concurrency = AIMDController(
+            self.max_concurrency, latency_target=self.latency_target
+        )
+        self._window = SlidingWindow(self.max_rpm)
+        
+        # Closed while a rate-limited request probes for recovery, so the other
+        # requests don't all retry at once and trip the limit again
+        self._rate_limit_gate = asyncio.Event()
+        self._rate_limit_gate.set()
+        
+        self._session = aiohttp.ClientSession(
+            # Keep idle connections (and their TLS sessions) warm across short waits;
+            # a pause until the hourly reset reconnects, which is negligible by then
+            connector=aiohttp.TCPConnector(
+                limit=self.MAX_CONNECTIONS,
+                keepalive_timeout=self.KEEPALIVE_SECONDS
+            ),
+            headers=self.headers,
+            timeout=aiohttp.ClientTimeout(total=30)
+        )
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        """Close the HTTP session."""
+        if self._session:
+            await self._session.close()
+            self._session = None
+        if self._cache is not None:
+            self._cache.close()
+    
+    @staticmethod
+    def _cache_key(query: str, variables: Optional[Dict[str, Any]]) -> str:
+        """Build a stable cache key for a query and its variables."""
+        raw = query.encode() + orjson.dumps(variables, option=orjson.OPT_SORT_KEYS)
+        return hashlib.sha256(raw).hexdigest()
+        
+    async def _execute_query(self, query: str, variables: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Execute a GraphQL query with retry logic.
         
@@ -61,151 +368,457 @@ class GitHubGraphQLClient:
             
         Raises:
             RateLimitExceeded: If rate limit is exceeded
-            requests.RequestException: If request fails after retries
+            aiohttp.ClientError: If request fails after retries
         """
+        if self._session is None:
+            raise RuntimeError("GitHubGraphQLClient must be used as an async context manager")
+        
         payload = {"query": query}
         if variables:
             payload["variables"] = variables
+        # Serialized once up front; the session already sends Content-Type: application/json
+        payload_bytes = orjson.dumps(payload)
+        
+        # Reuse a cached response; with an ETag, revalidate it with a conditional request.
+        # The cache is SQLite-backed, so its reads and writes run off the event loop
+        cache_key = None
+        request_headers = None
+        if self._cache is not None:
+            cache_key = self._cache_key(query, variables)
+            cached = await asyncio.to_thread(self._cache.get, cache_key)
+            if cached is not None:
+                if not cached["etag"]:
+                    return cached["body"]
+                request_headers = {"If-None-Match": cached["etag"]}
             
-        for attempt in range(self.MAX_RETRIES):
-            try:
-                response = requests.post(
-                    self.GRAPHQL_ENDPOINT,
-                    json=payload,
-                    headers=self.headers,
-                    timeout=30
-                )
+        probing = False
+        try:
+            for attempt in range(self.MAX_RETRIES):
+                # While another request probes a rate limit, wait for it to clear
+                if not probing:
+                    await self._rate_limit_gate.wait()
                 
-                if response.status_code == 200:
-                    data = response.json()
-                    
-                    # Check for GraphQL errors
-                    if "errors" in data:
-                        error_messages = [err.get("message", "") for err in data["errors"]]
-                        
-                        # Check for rate limit errors
-                        if any("rate limit" in msg.lower() for msg in error_messages):
-                            # Check rate limit info from response headers
-                            remaining = int(response.headers.get("X-RateLimit-Remaining", 0))
-                            reset_time = int(response.headers.get("X-RateLimit-Reset", 0))
-                            
-                            if remaining <= self.RATE_LIMIT_BUFFER:
-                                wait_time = max(reset_time - int(time.time()), 0) + 10
-                                logger.warning(f"Rate limit approaching. Waiting {wait_time} seconds...")
-                                time.sleep(wait_time)
-                                continue
-                            else:
-                                raise RateLimitExceeded(f"Rate limit exceeded: {error_messages}")
-                        
-                        # Other GraphQL errors
-                        raise Exception(f"GraphQL errors: {error_messages}")
-                    
-                    return data.get("data", {})
+                await self._window.acquire()
                 
-                elif response.status_code == 401:
-                    raise Exception("Authentication failed. Check your GitHub token.")
-                elif response.status_code == 403:
-                    # Rate limit or forbidden
-                    remaining = int(response.headers.get("X-RateLimit-Remaining", 0))
-                    reset_time = int(response.headers.get("X-RateLimit-Reset", 0))
-                    
-                    if remaining == 0:
-                        wait_time = max(reset_time - int(time.time()), 0) + 10
-                        logger.warning(f"Rate limit exceeded. Waiting {wait_time} seconds...")
-                        if attempt < self.MAX_RETRIES - 1:
-                            time.sleep(wait_time)
-                            continue
-                        raise RateLimitExceeded("Rate limit exceeded")
+                sent_at, status, headers, body, error = await self._post(payload_bytes, request_headers)
+                latency = time.monotonic() - sent_at
+                if error is not None:
+                    if attempt == self.MAX_RETRIES - 1:
+                        raise error
+                    wait_time, rate_limit = self._handle_request_error(error, attempt, sent_at)
+                else:
+                    if status == 200:
+                        data = orjson.loads(body)
+                        if "errors" not in data:
+                            # Fast path: successful response
+                            self._concurrency.on_success(latency)
+                            result = data.get("data", {})
+                            if cache_key is not None:
+                                # Without rateLimit, so a hit never replays a stale budget
+                                cached_result = {k: v for k, v in result.items() if k != "rateLimit"}
+                                await asyncio.to_thread(
+                                    self._cache.set,
+                                    cache_key,
+                                    {"etag": headers.get("ETag"), "body": cached_result},
+                                    expire=self.CACHE_TTL_SECONDS
+                                )
+                            return result
+                        partial = self._partial_result(data)
+                        if partial is not None:
+                            self._concurrency.on_success(latency)
+                            return partial
+                        wait_time, rate_limit = self._handle_graphql_errors(data["errors"], headers, sent_at)
+                    elif status == 304:
+                        # Not modified; doesn't count against the rate limit
+                        return cached["body"]
                     else:
-                        raise Exception(f"Forbidden: {response.text}")
+                        wait_time, rate_limit = self._handle_http_error(status, headers, body, attempt, sent_at)
                 
-                else:
+                if rate_limit is None:
+                    await asyncio.sleep(wait_time)
+                elif probing or self._rate_limit_gate.is_set():
+                    # First request to hit the limit closes the gate and is the only
+                    # one to retry; the rest resume once it gets through
+                    self._rate_limit_gate.clear()
+                    probing = True
+                    logger.warning("%s. Waiting %d seconds...", rate_limit, wait_time)
+                    await asyncio.sleep(wait_time)
+            
+            raise Exception("Max retries exceeded")
+        finally:
+            if probing:
+                self._rate_limit_gate.set()
+    
+    async def _post(
+        self, payload: bytes, request_headers: Optional[Dict[str, str]]
+    ) -> tuple[float, Optional[int], Any, bytes, Optional[Exception]]:
+        """
+        Send one GraphQL request and read its response.
+        
+        The concurrency slot is held only for the round-trip, never while the
+        caller waits out a rate limit. The send time is taken when the slot is
+        acquired, so it is also reported for failed requests.
+        
+        Args:
+            payload: Serialized request body
+            request_headers: Extra headers for this request, if any
+            
+        Returns:
+            Tuple of (monotonic time the request was sent, HTTP status, response
+            headers, response body, error). A transport error or a status other
+            than 200, 304, 401 and 403 is returned as the error (an
+            aiohttp.ClientError or asyncio.TimeoutError) with no status.
+        """
+        sent_at = time.monotonic()
+        try:
+            async with self._concurrency as sent_at, self._session.post(
+                self.GRAPHQL_ENDPOINT, data=payload, headers=request_headers
+            ) as response:
+                if response.status not in (200, 304, 401, 403):
                     response.raise_for_status()
-                    
-            except requests.exceptions.RequestException as e:
-                if attempt < self.MAX_RETRIES - 1:
-                    delay = self.RETRY_DELAY_SECONDS * (2 ** attempt)  # Exponential backoff
-                    logger.warning(f"Request failed (attempt {attempt + 1}/{self.MAX_RETRIES}): {e}. Retrying in {delay}s...")
-                    time.sleep(delay)
-                else:
-                    raise
+                body = await response.read()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            return sent_at, None, None, b"", e
+        return sent_at, response.status, response.headers, body, None
+    
+    def _partial_result(self, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Salvage the usable fields of a response that carries both data and errors.
+        
+        GitHub returns partial data when one aliased search fails (e.g. a search
+        timeout); the failed fields are set to None so callers drop only those.
+        Partial responses are never cached.
+        
+        Args:
+            data: Parsed GraphQL response with ``errors``
+            
+        Returns:
+            Response data with failed top-level fields set to None, or None if
+            there is no data or the errors are rate-limit errors
+        """
+        result = data.get("data")
+        errors = data["errors"]
+        error_messages = [err.get("message", "") for err in errors]
+        if not result or any("rate limit" in msg.lower() for msg in error_messages):
+            return None
+        
+        for err in errors:
+            path = err.get("path")
+            if path:
+                result[path[0]] = None
+        
+        logger.warning("GraphQL returned partial data: %s", error_messages)
+        return result
+    
+    def _handle_graphql_errors(self, errors: List[Dict[str, Any]], headers: Any, sent_at: float) -> tuple[float, Optional[str]]:
+        """
+        Decide how to retry a response carrying GraphQL errors.
+        
+        Args:
+            errors: The ``errors`` of the GraphQL response
+            headers: Response headers
+            sent_at: Monotonic time the request was sent
+            
+        Returns:
+            Tuple of (seconds to wait, rate-limit reason, or None for a plain
+            retry backoff)
+            
+        Raises:
+            RateLimitExceeded: If rate limited while budget above the buffer remains
+            Exception: For any other GraphQL error
+        """
+        error_messages = [err.get("message", "") for err in errors]
+        
+        # Other GraphQL errors
+        if not any("rate limit" in msg.lower() for msg in error_messages):
+            raise Exception(f"GraphQL errors: {error_messages}")
+        
+        # Rate limit errors: check rate limit info from response headers
+        self._concurrency.on_error(sent_at)
+        remaining = int(headers.get("X-RateLimit-Remaining", 0))
+        reset_time = int(headers.get("X-RateLimit-Reset", 0))
+        
+        if remaining > self.RATE_LIMIT_BUFFER:
+            raise RateLimitExceeded(f"Rate limit exceeded: {error_messages}")
+        
+        wait_time = max(reset_time - int(time.time()), 0) + 10
+        return wait_time, "Rate limit approaching"
+    
+    def _handle_http_error(
+        self, status: int, headers: Any, body: bytes, attempt: int, sent_at: float
+    ) -> tuple[float, Optional[str]]:
+        """
+        Decide how to retry a 401 or 403 response.
+        
+        Args:
+            status: HTTP status
+            headers: Response headers
+            body: Response body
+            attempt: Zero-based attempt number
+            sent_at: Monotonic time the request was sent
+            
+        Returns:
+            Tuple of (seconds to wait, rate-limit reason, or None for a plain
+            retry backoff)
+            
+        Raises:
+            RateLimitExceeded: If still rate limited on the last attempt
+            Exception: If authentication failed or access is forbidden
+        """
+        if status == 401:
+            raise Exception("Authentication failed. Check your GitHub token.")
+        
+        # Rate limit or forbidden
+        remaining = int(headers.get("X-RateLimit-Remaining", 0))
+        reset_time = int(headers.get("X-RateLimit-Reset", 0))
+        
+        if remaining == 0:
+            self._concurrency.on_error(sent_at)
+            wait_time = max(reset_time - int(time.time()), 0) + 10
+            if attempt == self.MAX_RETRIES - 1:
+                raise RateLimitExceeded("Rate limit exceeded")
+            return wait_time, "Rate limit exceeded"
+        
+        if "Retry-After" in headers:
+            # Secondary rate limit: GitHub says how long to back off
+            self._concurrency.on_error(sent_at)
+            wait_time = int(headers["Retry-After"])
+            if attempt == self.MAX_RETRIES - 1:
+                raise RateLimitExceeded("Secondary rate limit exceeded")
+            return wait_time, "Secondary rate limit hit"
+        
+        raise Exception(f"Forbidden: {body.decode(errors='replace')}")
+    
+    def _handle_request_error(self, error: Exception, attempt: int, sent_at: float) -> tuple[float, Optional[str]]:
+        """
+        Decide how to retry a failed request (transport error or error status).
+        
+        Args:
+            error: The aiohttp or timeout error raised by the request
+            attempt: Zero-based attempt number
+            sent_at: Monotonic time the request was sent
+            
+        Returns:
+            Tuple of (seconds to wait, rate-limit reason, or None for a plain
+            retry backoff)
+        """
+        status = error.status if isinstance(error, aiohttp.ClientResponseError) else None
+        
+        # Throttling, server errors and timeouts mean GitHub is overloaded
+        if status is None or status == 429 or status >= 500:
+            self._concurrency.on_error(sent_at)
+        
+        retry_after = ""
+        if status is not None and error.headers:
+            retry_after = error.headers.get("Retry-After", "")
+        retry_after = int(retry_after) if retry_after.isdigit() else 0
+        
+        # Exponential backoff, but never sooner than Retry-After
+        delay = max(self.RETRY_DELAY_SECONDS * (2 ** attempt), retry_after)
+        if status == 429:
+            return delay, "Too many requests (429)"
         
-        raise Exception("Max retries exceeded")
+        logger.warning(
+            "Request failed (attempt %d/%d): %s. Retrying in %ds...",
+            attempt + 1, self.MAX_RETRIES, error, delay
+        )
+        return delay, None
     
-    def get_repositories(self, limit: int = 100, cursor: Optional[str] = None, search_query: str = "stars:>0") -> tuple[List[Repository], Optional[str], int]:
+    async def get_repositories(self, limit: int = 100, cursor: Optional[str] = None, search_query: str = "stars:>0") -> tuple[List[Repository], Optional[str], Optional[int], Optional[int]]:
         """
         Fetch repositories from GitHub using GraphQL.
         
+        Must be awaited within ``async with client:``; callers can run several
+        fetches concurrently with ``asyncio.gather``.
+        
         Args:
             limit: Maximum number of repositories to fetch (max 100 per query)
             cursor: Pagination cursor
             search_query: GitHub search query string (e.g., "stars:>0", "language:python")
             
         Returns:
-            Tuple of (list of repositories, next cursor, remaining API calls)
-        """
-        query = """
-        query($limit: Int!, $cursor: String, $searchQuery: String!) {
-            search(query: $searchQuery, type: REPOSITORY, first: $limit, after: $cursor) {
-                repositoryCount
-                pageInfo {
-                    hasNextPage
-                    endCursor
-                }
-                nodes {
-                    ... on Repository {
-                        id
-                        name
-                        nameWithOwner
-                        stargazerCount
-                        url
-                        createdAt
-                        updatedAt
-                    }
-                }
-            }
-            rateLimit {
-                remaining
-                resetAt
-            }
-        }
+            Tuple of (list of repositories, next cursor, remaining API calls,
+            epoch seconds at which the rate limit resets)
         """
+        repositories, next_cursor, remaining, reset_at = await self.fetch_page(
+            limit=limit, cursor=cursor, search_query=search_query
+        )
+        return list(repositories), next_cursor, remaining, reset_at
+    
+    async def fetch_page(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        search_query: str = "stars:>0"
+    ) -> tuple[Iterator[Repository], Optional[str], Optional[int], Optional[int]]:
+        """
+        Fetch one page of a search without materializing its repositories.
         
-        variables = {
-            "limit": min(limit, 100),
-            "cursor": cursor,
-            "searchQuery": search_query
-        }
-        data = self._execute_query(query, variables)
+        Repositories are built as the returned iterator is consumed, so a
+        caller that walks the page once skips the intermediate list. Backs the
+        single-search helpers; batched crawling uses ``get_repositories_multi``.
+        
+        Args:
+            limit: Maximum number of repositories to fetch (max 100 per query)
+            cursor: Pagination cursor
+            search_query: GitHub search query string
+            
+        Returns:
+            Tuple of (iterator of repositories, next cursor, remaining API
+            calls, epoch seconds at which the rate limit resets)
+        """
+        variables = {"limit": min(limit, 100), "query0": search_query, "cursor0": cursor}
+        data = await self._execute_query(_build_search_query(1), variables)
+        
+        search_result = data.get("s0")
+        if search_result is None:
+            raise Exception(f"Search failed for query: {search_query}")
+        
+        repositories, next_cursor = self._parse_search_result(search_result)
+        remaining, reset_at = self._read_rate_limit(data)
+        return repositories, next_cursor, remaining, reset_at
+    
+    async def iter_repositories(self, search_query: str = "stars:>0", limit: int = 100) -> AsyncIterator[Repository]:
+        """
+        Yield every repository of a search, prefetching one page ahead.
         
-        search_result = data.get("search", {})
+        The next page is requested as soon as the current page's cursor is
+        known, so its round-trip overlaps with the caller's processing of the
+        repositories being yielded.
+        
+        Args:
+            search_query: GitHub search query string
+            limit: Maximum number of repositories per page (max 100)
+        
+        Yields:
+            Repositories in search order
+        """
+        task = asyncio.create_task(self.fetch_page(limit=limit, search_query=search_query))
+        try:
+            while task is not None:
+                repositories, next_cursor, _, _ = await task
+                task = None
+                if next_cursor:
+                    task = asyncio.create_task(
+                        self.fetch_page(limit=limit, cursor=next_cursor, search_query=search_query)
+                    )
+                for repository in repositories:
+                    yield repository
+        finally:
+            # Don't leave a prefetch running if the caller stops early
+            if task is not None:
+                task.cancel()
+    
+    async def get_repositories_batch(
+        self,
+        cursors: List[Optional[str]],
+        limit: int = 100,
+        search_query: str = "stars:>0"
+    ) -> tuple[List[Optional[tuple[List[Repository], Optional[str]]]], Optional[int], Optional[int]]:
+        """
+        Fetch several pages of one search in a single GraphQL request.
+        
+        Useful when the cursors are already known (e.g. resuming or re-checking
+        pages); each cursor becomes an aliased ``search`` of the same document.
+        
+        Args:
+            cursors: Pagination cursors, one per page to fetch
+            limit: Maximum number of repositories per page (max 100)
+            search_query: GitHub search query string
+        
+        Returns:
+            Tuple of (list of (repositories, next cursor) per cursor, in order,
+            or None for a page that failed, remaining API calls, epoch seconds
+            at which the rate limit resets)
+        """
+        return await self.get_repositories_multi(
+            [(search_query, cursor) for cursor in cursors], limit=limit
+        )
+
+    async def get_repositories_multi(
+        self,
+        searches: List[tuple[str, Optional[str]]],
+        limit: int = 100
+    ) -> tuple[List[Optional[tuple[List[Repository], Optional[str]]]], Optional[int], Optional[int]]:
+        """
+        Fetch one page for each of several searches in a single GraphQL request.
+        
+        Each search becomes an aliased ``search`` field of the same query
+        document, so N pages cost one HTTP round-trip instead of N. A search
+        that fails on GitHub's side doesn't fail the others.
+        
+        Args:
+            searches: (search query, pagination cursor) pairs
+            limit: Maximum number of repositories per search (max 100)
+            
+        Returns:
+            Tuple of (list of (repositories, next cursor) per search, in order,
+            or None for a search that failed, remaining API calls, epoch seconds
+            at which the rate limit resets)
+        """
+        variables: Dict[str, Any] = {"limit": min(limit, 100)}
+        for i, (search_query, cursor) in enumerate(searches):
+            variables[f"query{i}"] = search_query
+            variables[f"cursor{i}"] = cursor
+        
+        data = await self._execute_query(_build_search_query(len(searches)), variables)
+        
+        results = []
+        for i in range(len(searches)):
+            search_result = data.get(f"s{i}")
+            if search_result is None:
+                results.append(None)
+                continue
+            repositories, next_cursor = self._parse_search_result(search_result)
+            results.append((list(repositories), next_cursor))
+        
+        remaining, reset_at = self._read_rate_limit(data)
+        return results, remaining, reset_at
+    
+    def _read_rate_limit(self, data: Dict[str, Any]) -> tuple[Optional[int], Optional[int]]:
+        """
+        Read the rate limit of a response and tighten request pacing to match.
+        
+        Responses without ``rateLimit`` (cache hits, or a partial response
+        where it failed) report the last values seen from GitHub instead.
+        
+        Args:
+            data: GraphQL response data including ``rateLimit``
+            
+        Returns:
+            Tuple of (remaining API calls, epoch seconds at which the rate limit
+            resets); either is None until GitHub has reported it
+        """
+        rate_limit = data.get("rateLimit")
+        if not rate_limit:
+            return self._rate_remaining, self._rate_reset_at
+        
+        remaining = rate_limit.get("remaining", 0)
+        reset_at = rate_limit.get("resetAt")
+        if reset_at:
+            reset_at = int(_parse_gh_ts(reset_at).timestamp())
+        self._rate_remaining = remaining
+        self._rate_reset_at = reset_at
+        
+        # Never start more requests in a window than the budget above the buffer allows
+        self._window.rpm = max(1, min(self.max_rpm, remaining - self.RATE_LIMIT_BUFFER))
+        
+        return remaining, reset_at
+    
+    def _parse_search_result(self, search_result: Dict[str, Any]) -> tuple[Iterator[Repository], Optional[str]]:
+        """
+        Convert one search connection into repositories and the next cursor.
+        
+        Args:
+            search_result: The ``search`` field of a GraphQL response
+            
+        Returns:
+            Tuple of (lazy iterator of repositories, next cursor)
+        """
         nodes = search_result.get("nodes", [])
         page_info = search_result.get("pageInfo", {})
-        rate_limit = data.get("rateLimit", {})
-        
-        repositories = []
-        for node in nodes:
-            # Parse owner from nameWithOwner
-            owner, name = node["nameWithOwner"].split("/", 1)
-            
-            # Parse datetime strings
-            created_at = datetime.fromisoformat(node["createdAt"].replace("Z", "+00:00"))
-            updated_at = datetime.fromisoformat(node["updatedAt"].replace("Z", "+00:00"))
-            
-            repo = Repository(
-                id=node["id"],
-                name=name,
-                owner=owner,
-                full_name=node["nameWithOwner"],
-                stars=node["stargazerCount"],
-                url=node["url"],
-                created_at=created_at,
-                updated_at=updated_at
-            )
-            repositories.append(repo)
         
+        repositories = _build_repositories(nodes)
         next_cursor = page_info.get("endCursor") if page_info.get("hasNextPage") else None
-        remaining = rate_limit.get("remaining", 0)
         
-        return repositories, next_cursor, remaining
-
+        return repositories, next_cursor